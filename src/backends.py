@@ -0,0 +1,166 @@
+import pandas as pd
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from logging_config import logger
+
+
+class DatabaseBackend:
+    """
+    A generic database backend for any SQLAlchemy database url, loading with pandas to_sql
+    ...
+
+    Attributes
+    ----------
+    url : str
+        database url
+    engine : sqlalchemy.engine.Engine
+        SQL database engine
+    Methods
+    -------
+    load_dataframe:
+        Store a data frame as table, if the table exists it is dropped and replaced
+    read_sql_query:
+        Run a query and return its result as data frame
+    """
+
+    name = "generic"
+
+    def __init__(self, url: str):
+        self.url = url
+        self.engine = create_engine(url=url)
+
+    def load_dataframe(self, df: pd.DataFrame, table_name: str) -> None:
+        """
+        Store a data frame as table, if the table exists it is dropped and replaced
+        :param df: Pandas data frame to be stored
+        :param table_name: SQL database table name
+        """
+        df.to_sql(name=table_name, con=self.engine, if_exists="replace", index=False, chunksize=10000)
+
+    def read_sql_query(self, query: str) -> pd.DataFrame:
+        """
+        Run a query and return its result as data frame
+        :param query: SQL query
+        :return: Pandas data frame with the query result
+        """
+        return pd.read_sql_query(sql=query, con=self.engine)
+
+
+class SQLiteBackend(DatabaseBackend):
+    """
+    A SQLite database backend. Every connection uses WAL journal mode, so readers don't block on a loading writer,
+    and the data frames are loaded with a single executemany in one transaction.
+    """
+
+    name = "sqlite"
+
+    PRAGMAS = {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "temp_store": "MEMORY",
+        "cache_size": -64000,
+        "mmap_size": 268435456,
+    }
+
+    def __init__(self, url: str):
+        super().__init__(url=url)
+        event.listen(self.engine, "connect", self.set_pragmas)
+
+    def set_pragmas(self, dbapi_connection, connection_record) -> None:
+        """
+        Set the SQLite pragmas on a new connection, in-memory databases ignore the WAL journal mode
+        """
+        cursor = dbapi_connection.cursor()
+        for pragma, value in self.PRAGMAS.items():
+            cursor.execute(f"PRAGMA {pragma} = {value}")
+        cursor.close()
+
+    def load_dataframe(self, df: pd.DataFrame, table_name: str) -> None:
+        """
+        Store a data frame as table with a batched insert of all rows, if the table exists it is dropped and replaced.
+        A failed load is rolled back and the previous table is kept, the readers see the previous rows until the commit.
+        :param df: Pandas data frame to be stored
+        :param table_name: SQL database table name
+        """
+        create_table = pd.io.sql.get_schema(df, table_name)
+        insert = f"INSERT INTO {table_name} VALUES ({', '.join('?' * len(df.columns))})"
+        # Python objects with None for the missing values, the datetime columns are stored as text
+        values = df.astype({column: str for column in df.select_dtypes(include="datetime").columns})
+        rows = values.astype(object).where(values.notna(), None).itertuples(index=False, name=None)
+
+        connection = self.engine.raw_connection()
+        try:
+            cursor = connection.cursor()
+            # sqlite3 opens a transaction implicitly only before DML statements, without the explicit BEGIN the DROP
+            # and CREATE TABLE are committed on their own and a failed load leaves an empty table behind
+            cursor.execute("BEGIN IMMEDIATE")
+            cursor.execute(f"DROP TABLE IF EXISTS {table_name}")
+            cursor.execute(create_table)
+            cursor.executemany(insert, rows)
+            if "hours_forecast" in df.columns:
+                cursor.execute(f"CREATE INDEX ix_{table_name}_hours_forecast ON {table_name} (hours_forecast)")
+            cursor.close()
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            connection.close()
+
+
+class DuckDBBackend(DatabaseBackend):
+    """
+    A DuckDB embedded analytical database backend for duckdb:///<file path> urls, duckdb:///:memory: for an
+    in-memory database. The data frames are appended directly from pandas without SQL inserts.
+    """
+
+    name = "duckdb"
+
+    def __init__(self, url: str):
+        try:
+            import duckdb
+        except ImportError as error:
+            error_msg = f"The {self.__class__.__name__} requires the duckdb package: {error}"
+            logger.error(error_msg)
+            raise Exception(error_msg)
+
+        self.url = url
+        self.engine = duckdb.connect(database=make_url(url).database or ":memory:")
+
+    def load_dataframe(self, df: pd.DataFrame, table_name: str) -> None:
+        """
+        Store a data frame as table, if the table exists it is replaced
+        :param df: Pandas data frame to be stored
+        :param table_name: SQL database table name
+        """
+        self.engine.register("load_dataframe_view", df)
+        try:
+            self.engine.execute(f"CREATE OR REPLACE TABLE {table_name} AS SELECT * FROM load_dataframe_view")
+        finally:
+            self.engine.unregister("load_dataframe_view")
+
+    def read_sql_query(self, query: str) -> pd.DataFrame:
+        """
+        Run a query and return its result as data frame
+        :param query: SQL query
+        :return: Pandas data frame with the query result
+        """
+        return self.engine.execute(query).df()
+
+
+BACKENDS = {
+    "sqlite": SQLiteBackend,
+    "duckdb": DuckDBBackend,
+}
+
+
+def get_backend(url: str) -> DatabaseBackend:
+    """
+    Create the database backend for a database url, the generic backend is used for the databases without a
+    dedicated backend
+    :param url: database url, e.g. sqlite:///weather_db.db or duckdb:///weather_db.duckdb
+    :return: Database backend
+    """
+    backend_class = BACKENDS.get(make_url(url).get_backend_name(), DatabaseBackend)
+    logger.info("Using the %s database backend for %s", backend_class.name, url)
+    return backend_class(url=url)
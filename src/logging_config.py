@@ -0,0 +1,195 @@
+import json
+import queue
+import multiprocessing
+import atexit
+import random
+import logging
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+from logging.handlers import QueueHandler, QueueListener
+
+LOGGER_NAME = "weather_forecast"
+
+# Package logger, it stays silent until configure_logging is called by the application
+logger = logging.getLogger(LOGGER_NAME)
+logger.addHandler(logging.NullHandler())
+
+# Attributes every LogRecord has, anything else was passed through the extra argument of the logging call
+RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "taskName"}
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    A log formatter writing every record as a single line JSON object, including the extra fields of the record
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        log_entry = {
+            "time": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in RECORD_ATTRIBUTES:
+                log_entry[key] = value
+        if record.exc_info:
+            log_entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(log_entry, default=str)
+
+
+class SamplingQueueHandler(QueueHandler):
+    """
+    A queue handler holding the fraction of the per-query records to be kept, see sample_query_log
+    """
+
+    def __init__(self, record_queue, query_sample_rate: float = 1.0):
+        super().__init__(record_queue)
+        self.query_sample_rate = query_sample_rate
+
+
+class LazyQueueHandler(SamplingQueueHandler):
+    """
+    A queue handler passing the records unchanged to its listener thread writing them to the file handler. The
+    listener lives in the same process, so the message formatting is left to the listener instead of being done by
+    the logging caller.
+    """
+
+    def __init__(self, file_handler: logging.Handler, query_sample_rate: float = 1.0):
+        super().__init__(queue.SimpleQueue(), query_sample_rate=query_sample_rate)
+        self.file_listener = QueueListener(self.queue, file_handler)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def get_queue_handler(handler_class: type = SamplingQueueHandler) -> Optional[SamplingQueueHandler]:
+    """
+    Get the queue handler of the package logger, it holds the whole logging state of the process
+    :param handler_class: queue handler class to look for
+    :return: The queue handler, None when logging is not configured
+    """
+    return next((handler for handler in logger.handlers if isinstance(handler, handler_class)), None)
+
+
+def sample_query_log() -> bool:
+    """
+    Decide if a per-query record should be logged, it is called before the logging call, so the dropped records are
+    never created. Records are kept with the query_sample_rate probability of configure_logging.
+    :return: True when the per-query record should be logged
+    """
+    if not logger.isEnabledFor(logging.INFO):
+        return False
+    queue_handler = get_queue_handler()
+    if queue_handler is None or queue_handler.query_sample_rate >= 1:
+        return True
+    return random.random() < queue_handler.query_sample_rate
+
+
+def configure_logging(
+        file: str = "weather_forecast_logs.log",
+        level: str = "INFO",
+        json_format: bool = False,
+        query_sample_rate: float = 1.0) -> QueueListener:
+    """
+    Configure the package logger to write to a log file through a queue, so the logging callers never block on the
+    file I/O. Calling it again replaces the previous configuration.
+    :param file: log file path
+    :param level: logging level name, e.g. 'DEBUG' or 'INFO'
+    :param json_format: write the records as JSON objects instead of plain text
+    :param query_sample_rate: fraction in range [0, 1] of the per-query records to be kept, see sample_query_log
+    :return: The started queue listener writing the records to the log file
+    """
+    stop_logging()
+
+    file_handler = logging.FileHandler(filename=file, encoding="utf-8")
+    file_handler.setFormatter(
+        JsonFormatter() if json_format else logging.Formatter("%(asctime)s:%(levelname)s:%(message)s")
+    )
+    queue_handler = LazyQueueHandler(file_handler=file_handler, query_sample_rate=query_sample_rate)
+
+    logger.addHandler(queue_handler)
+    logger.setLevel(level.upper())
+    logger.propagate = False
+
+    queue_handler.file_listener.start()
+    return queue_handler.file_listener
+
+
+def remove_queue_handlers() -> None:
+    """
+    Remove the queue handlers from the package logger without stopping their listeners
+    """
+    for handler in list(logger.handlers):
+        if isinstance(handler, SamplingQueueHandler):
+            logger.removeHandler(handler)
+
+
+def stop_logging() -> None:
+    """
+    Flush the queued records and remove the handlers added by configure_logging
+    """
+    queue_handler = get_queue_handler(handler_class=LazyQueueHandler)
+    if queue_handler is not None:
+        queue_handler.file_listener.stop()
+        for handler in queue_handler.file_listener.handlers:
+            handler.close()
+    remove_queue_handlers()
+
+
+def start_worker_logging() -> Tuple[Optional[multiprocessing.Queue], Optional[QueueListener]]:
+    """
+    Start a listener draining a multiprocessing queue into the handlers of the configured logging. Worker processes
+    inherit the in-process queue of configure_logging, but its listener thread only exists in the parent process,
+    so the workers log through this queue instead, see init_worker_logging.
+    :return: A tuple with the multiprocessing queue and its started listener, (None, None) when logging is not
+    configured
+    """
+    queue_handler = get_queue_handler(handler_class=LazyQueueHandler)
+    if queue_handler is None:
+        return None, None
+
+    worker_queue = multiprocessing.Queue()
+    worker_listener = QueueListener(worker_queue, *queue_handler.file_listener.handlers)
+    worker_listener.start()
+    return worker_queue, worker_listener
+
+
+def stop_worker_logging(worker_listener: Optional[QueueListener]) -> None:
+    """
+    Flush the worker records to the log file and stop the listener started by start_worker_logging
+    :param worker_listener: listener returned by start_worker_logging
+    """
+    if worker_listener is not None:
+        worker_listener.stop()
+
+
+def init_worker_logging(worker_queue: Optional[multiprocessing.Queue], level: int, query_sample_rate: float) -> None:
+    """
+    Worker process initializer replacing the inherited logging handlers with a handler on the worker queue
+    :param worker_queue: multiprocessing queue returned by start_worker_logging, None when logging is not configured
+    :param level: logging level of the package logger
+    :param query_sample_rate: fraction in range [0, 1] of the per-query records to be kept
+    """
+    # The inherited listener thread doesn't exist in the worker process, so it is not stopped
+    remove_queue_handlers()
+    if worker_queue is None:
+        return
+
+    logger.addHandler(SamplingQueueHandler(worker_queue, query_sample_rate=query_sample_rate))
+    logger.setLevel(level)
+    logger.propagate = False
+
+
+def get_worker_logging_args(worker_queue: Optional[multiprocessing.Queue]) -> tuple:
+    """
+    Get the init_worker_logging arguments for the current logging configuration
+    :param worker_queue: multiprocessing queue returned by start_worker_logging
+    :return: A tuple with the init_worker_logging arguments
+    """
+    queue_handler = get_queue_handler()
+    query_sample_rate = queue_handler.query_sample_rate if queue_handler is not None else 1.0
+    return worker_queue, logger.level, query_sample_rate
+
+
+atexit.register(stop_logging)
@@ -1,9 +1,300 @@
+import json
+import time
+import argparse
+import pandas as pd
 from weather_class import WeatherForecast
+from utils import ConfigParser, parse_shard, extract_weather_data, extract_weather_data_shard, merge_shard_files, \
+    iter_locations
+from logging_config import configure_logging
+from replay import ReplayServer, read_archive, record_responses, generate_locations
 
+OUTPUT_FORMATS = ["table", "json", "csv"]
 
-if __name__ == "__main__":
+
+def positive_int(value: str) -> int:
+    """
+    Parse a command line argument as an integer greater than zero
+    :param value: command line argument value
+    :return: Parsed integer
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{value}'")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"{value} is not a positive integer")
+    return number
+
+
+def parse_args(argv: list = None) -> argparse.Namespace:
+    """
+    Parse the command line arguments
+    :param argv: list of command line arguments, defaults to sys.argv
+    :return: Parsed command line arguments
+    """
+    parser = argparse.ArgumentParser(
+        description="Weather forecast data extraction and analysis. Without a command the weather data is extracted, "
+                    "loaded into the database and all metrics are printed for the next 24 hours."
+    )
+    parser.add_argument(
+        "--env", choices=["main", "replay"], default="main",
+        help="config file to be used, 'replay' points the API urls to the local stand-in server started with serve"
+    )
+    parser.add_argument("--log-file", default="weather_forecast_logs.log", help="log file path")
+    parser.add_argument(
+        "--log-level", choices=["DEBUG", "INFO", "WARNING", "ERROR"], default="INFO", help="logging level"
+    )
+    parser.add_argument("--log-json", action="store_true", help="write the log records as JSON objects")
+    parser.add_argument(
+        "--log-query-sample-rate", type=float, default=1.0,
+        help="fraction in range [0, 1] of the per-query log records to be kept"
+    )
+    subparsers = parser.add_subparsers(dest="command")
+
+    # fetch command
+    fetch_parser = subparsers.add_parser(
+        "fetch", help="extract the weather forecast data from the OpenWeatherMap API to the weather CSV file"
+    )
+    extraction_group = fetch_parser.add_mutually_exclusive_group()
+    extraction_group.add_argument(
+        "--shard",
+        help="extract only the shard 'i/N' of the locations to a partial CSV file, e.g. '0/4'"
+    )
+    extraction_group.add_argument(
+        "--processes", type=int, default=1,
+        help="number of worker processes extracting the locations in parallel shards"
+    )
+
+    # load command
+    load_parser = subparsers.add_parser("load", help="load the weather CSV file into the database")
+    load_parser.add_argument(
+        "--merge-shards", type=int, metavar="N",
+        help="merge the partial CSV files of N shards into the weather CSV file before loading it"
+    )
+
+    # query and bench commands
+    query_parser = subparsers.add_parser("query", help="query a metric from the database for one or more periods")
+    query_parser.add_argument("metric", choices=list(WeatherForecast.METRICS), help="metric name")
+    bench_parser = subparsers.add_parser("bench", help="measure the query time of the metrics in the database")
+    bench_parser.add_argument(
+        "--metric", action="append", choices=list(WeatherForecast.METRICS),
+        help="metric name, could be repeated, defaults to all metrics"
+    )
+    bench_parser.add_argument("--repeat", type=positive_int, default=10, help="number of timed runs per metric")
+    bench_parser.add_argument(
+        "--database", action="append",
+        help="database url to load the weather CSV file into and benchmark, could be repeated to compare backends, "
+             "e.g. sqlite:///bench.db or duckdb:///bench.duckdb"
+    )
+    for subparser in (query_parser, bench_parser):
+        subparser.add_argument(
+            "--hours", type=int, action="append",
+            help="forecasting period in hours, could be repeated, all periods are answered in a single query. "
+                 "Defaults to the maximum hour forecast value"
+        )
+        subparser.add_argument("--format", choices=OUTPUT_FORMATS, default="table", help="output format")
+
+    # record and serve commands
+    record_parser = subparsers.add_parser(
+        "record", help="record the live OpenWeatherMap API responses of the locations to the responses archive"
+    )
+    record_parser.add_argument("--archive", help="archive file path, defaults to the config responses_archive")
+    serve_parser = subparsers.add_parser(
+        "serve", help="serve the responses archive from a local stand-in server for the OpenWeatherMap APIs"
+    )
+    serve_parser.add_argument("--archive", help="archive file path, defaults to the config responses_archive")
+    serve_parser.add_argument("--host", default="127.0.0.1", help="server host")
+    serve_parser.add_argument("--port", type=int, default=8000, help="server port")
+    serve_parser.add_argument("--latency", type=float, default=0.0, help="delay in seconds added to every response")
+    serve_parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="probability in range [0, 1] to respond with status code 500"
+    )
+    serve_parser.add_argument(
+        "--city-count", type=int, default=0,
+        help="number of synthetic cities served in addition to the recorded locations"
+    )
+    serve_parser.add_argument("--seed", type=int, help="random seed of the simulated errors")
+    serve_parser.add_argument(
+        "--write-locations", metavar="FILE",
+        help="write the synthetic cities to a JSONL locations file, to be used as the config locations_file"
+    )
+
+    return parser.parse_args(argv)
+
+
+def format_output(df: pd.DataFrame, output_format: str) -> str:
+    """
+    Format a data frame for the command line output
+    :param df: Pandas data frame to be formatted
+    :param output_format: output format, one of 'table', 'json' or 'csv'
+    :return: formatted data frame
+    """
+    if output_format == "json":
+        return df.to_json(orient="records", date_format="iso")
+    if output_format == "csv":
+        return df.to_csv(index=False).rstrip("\n")
+    return df.to_string(index=False)
+
+
+def fetch(args: argparse.Namespace) -> None:
+    """
+    Extract the weather forecast data, either all locations or a single shard of them
+    :param args: parsed fetch command arguments
+    """
+    config = ConfigParser(env=args.env)
+    if args.shard:
+        # Extracting a single shard of the locations, the partial CSV files are merged later with load --merge-shards
+        shard_index, shard_count = parse_shard(args.shard)
+        shard_file = extract_weather_data_shard(
+            file=config.weather_data_csv,
+            locations=config.locations,
+            weather_api=config.weather_api,
+            geo_api=config.geocode_api,
+            appid=config.api_key,
+            shard_index=shard_index,
+            shard_count=shard_count
+        )
+        print(f"--- Extracted shard {args.shard} of the weather forecast data to {shard_file}")
+    else:
+        extract_weather_data(config=config, processes=args.processes)
+        print(f"--- Extracted the weather forecast data to {config.weather_data_csv}")
+
+
+def load(args: argparse.Namespace) -> None:
+    """
+    Load the weather CSV file into the database, optionally merging the partial CSV files of the shards first
+    :param args: parsed load command arguments
+    """
+    if args.merge_shards:
+        # Merging the partial CSV and quarantine files of all shards into the weather CSV and quarantine files
+        config = ConfigParser(env=args.env)
+        merge_shard_files(file=config.weather_data_csv, shard_count=args.merge_shards)
+    weather_forecast_object = WeatherForecast(extract=False, env=args.env)
+    print(f"--- Loaded {len(weather_forecast_object.weather_data)} rows into the database")
+
+
+def query(args: argparse.Namespace) -> None:
+    """
+    Print a metric from the already loaded database for the requested forecasting periods
+    :param args: parsed query command arguments
+    """
+    weather_forecast_object = WeatherForecast(extract=False, load=False, env=args.env)
+    hours_forecast = args.hours if args.hours else [weather_forecast_object.max_hours_forecast]
+    df = weather_forecast_object.get_metric(metric=args.metric, hours_forecast=hours_forecast)
+    print(format_output(df=df, output_format=args.format))
+
+
+def time_runs(function, repeat: int) -> dict:
+    """
+    Time the runs of a function
+    :param function: function without arguments to be timed
+    :param repeat: number of timed runs
+    :return: A dictionary with the minimum, mean and maximum run time in milliseconds
+    """
+    timings = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start_time) * 1000)
+    return {
+        "min_ms": round(min(timings), 3),
+        "mean_ms": round(sum(timings) / len(timings), 3),
+        "max_ms": round(max(timings), 3),
+    }
+
+
+def bench(args: argparse.Namespace) -> None:
+    """
+    Print the query time of the metrics for the requested forecasting periods. Without --database the already loaded
+    database is queried, otherwise the weather CSV file is loaded into every database and the time of storing the
+    already validated data frame is measured as well, comparing the database backends on the same workload.
+    :param args: parsed bench command arguments
+    """
+    results = []
+    for database in args.database or [None]:
+        if database:
+            weather_forecast_object = WeatherForecast(extract=False, load=True, env=args.env, database=database)
+            # Only the backend load is timed, the CSV parsing and the validation are the same for every backend
+            load_timings = time_runs(
+                function=lambda: weather_forecast_object.backend.load_dataframe(
+                    df=weather_forecast_object.weather_data, table_name=weather_forecast_object.config.table_name
+                ),
+                repeat=args.repeat
+            )
+            results.append(
+                {"backend": weather_forecast_object.backend.name, "metric": "load", "horizons": 0,
+                 "repeat": args.repeat, **load_timings}
+            )
+        else:
+            weather_forecast_object = WeatherForecast(extract=False, load=False, env=args.env)
+
+        hours_forecast = args.hours if args.hours else [weather_forecast_object.max_hours_forecast]
+        for metric in args.metric or WeatherForecast.METRICS:
+            metric_timings = time_runs(
+                function=lambda: weather_forecast_object.get_metric(metric=metric, hours_forecast=hours_forecast),
+                repeat=args.repeat
+            )
+            results.append(
+                {"backend": weather_forecast_object.backend.name, "metric": metric, "horizons": len(hours_forecast),
+                 "repeat": args.repeat, **metric_timings}
+            )
+    print(format_output(df=pd.DataFrame(results), output_format=args.format))
+
+
+def record(args: argparse.Namespace) -> None:
+    """
+    Record the live OpenWeatherMap API responses of the configured locations to the responses archive
+    :param args: parsed record command arguments
+    """
+    config = ConfigParser(env=args.env)
+    archive_file = args.archive if args.archive else config.responses_archive
+    record_responses(
+        file=archive_file,
+        locations_list=iter_locations(config.locations),
+        weather_api=config.weather_api,
+        geo_api=config.geocode_api,
+        appid=config.api_key
+    )
+    print(f"--- Recorded the OpenWeatherMap API responses to {archive_file}")
+
+
+def serve(args: argparse.Namespace) -> None:
+    """
+    Serve the responses archive from a local stand-in server until interrupted
+    :param args: parsed serve command arguments
+    """
+    config = ConfigParser(env=args.env)
+    archive_file = args.archive if args.archive else config.responses_archive
+    if args.write_locations:
+        with open(args.write_locations, "w", encoding="utf-8") as f:
+            for location in generate_locations(city_count=args.city_count):
+                f.write(json.dumps(location) + "\n")
+
+    server = ReplayServer(
+        archive=read_archive(file_path=archive_file),
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        city_count=args.city_count,
+        seed=args.seed
+    )
+    print(f"--- Serving {archive_file} on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def report(args: argparse.Namespace) -> None:
+    """
+    Extract the weather forecast data, load it into the database and print all metrics for the next 24 hours
+    :param args: parsed command line arguments
+    """
     # Extracting the weather forecast data and load it into a database
-    weather_forecast_object = WeatherForecast()
+    weather_forecast_object = WeatherForecast(env=args.env)
     print(
         "--- Creating an object of class WeatherForecast that extracts weather forecast data from OpenWeatherMap API"
         "and saves it to a CSV file which is then loaded into a database for analyzes."
@@ -56,3 +347,20 @@ if __name__ == "__main__":
         "\n\n--- Print the city with the strongest winds for the next 24 hours"
         f"\n------ Strongest winds city for 24 hours forecast:\n{strongest_winds_city_df}"
     )
+
+
+COMMANDS = {"fetch": fetch, "load": load, "query": query, "bench": bench, "record": record, "serve": serve}
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    configure_logging(
+        file=args.log_file,
+        level=args.log_level,
+        json_format=args.log_json,
+        query_sample_rate=args.log_query_sample_rate
+    )
+    if args.command:
+        COMMANDS[args.command](args)
+    else:
+        report(args)
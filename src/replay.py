@@ -0,0 +1,238 @@
+import gzip
+import json
+import time
+import random
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+from typing import List, Dict, Iterable, Tuple
+from utils import logger, get_data
+
+GEOCODE_PATH = "/geo/1.0/direct"
+ONECALL_PATH = "/data/3.0/onecall"
+
+
+def read_archive(file_path: str) -> Dict[str, Dict]:
+    """
+    Read a responses archive, either a gzip compressed (.gz) or a plain JSON file. The archive maps every location
+    to its recorded geocoding and weather forecast responses, the same layout as test_responses.json:
+    {"<city>,<country>": {"GeocodeAPI": [...], "WeatherAPI": {...}}}
+    :param file_path: archive file path
+    :return: A dictionary with the recorded responses per location
+    """
+    function_name = read_archive.__name__
+    try:
+        open_file = gzip.open if file_path.endswith(".gz") else open
+        with open_file(file_path, "rt", encoding="utf-8") as f:
+            archive = json.load(f)
+    except Exception as error:
+        error_msg = f"Error occurred in {function_name} function: {error}"
+        logger.error(error_msg)
+        raise Exception(error_msg)
+
+    return archive
+
+
+def write_archive(file_path: str, archive: Dict[str, Dict]) -> None:
+    """
+    Write a responses archive as compact JSON, gzip compressed when the file path ends with .gz
+    :param file_path: archive file path
+    :param archive: A dictionary with the recorded responses per location
+    """
+    open_file = gzip.open if file_path.endswith(".gz") else open
+    with open_file(file_path, "wt", encoding="utf-8") as f:
+        json.dump(archive, f, separators=(",", ":"))
+
+
+def record_responses(
+        file: str,
+        locations_list: Iterable[Dict],
+        weather_api: str,
+        geo_api: str,
+        appid: str) -> None:
+    """
+    Record the live OpenWeatherMap API responses for the locations to a responses archive
+    :param file: archive file path, gzip compressed when it ends with .gz
+    :param locations_list: iterable of country codes and cities which responses will be recorded
+    :param weather_api: weather forecast OpenWeatherMap API url
+    :param geo_api: geocoding OpenWeatherMap API url
+    :param appid: OpenWeatherMap API key
+    """
+    function_name = record_responses.__name__
+    logger.info("Calling function %s on file %s", function_name, file)
+    archive = {}
+    for location in locations_list:
+        city = location.get("city")
+        country = location.get("country")
+        geo_api_response = get_data(api=geo_api, payload={"q": f"{city},{country}", "limit": 1, "appid": appid})
+        weather_api_response = None
+        if geo_api_response:
+            weather_api_response = get_data(
+                api=weather_api,
+                payload={
+                    "lat": geo_api_response[0].get("lat"),
+                    "lon": geo_api_response[0].get("lon"),
+                    "exclude": "daily,minutely,current",
+                    "units": "metric",
+                    "appid": appid,
+                }
+            )
+        archive[f"{city},{country}"] = {"GeocodeAPI": geo_api_response, "WeatherAPI": weather_api_response}
+
+    write_archive(file_path=file, archive=archive)
+    logger.info(
+        "The %s function finished successfully. Recorded %s locations to: %s", function_name, len(archive), file
+    )
+
+
+def generate_locations(city_count: int) -> List[Dict]:
+    """
+    Generate the synthetic locations served by a ReplayServer configured with the same city count
+    :param city_count: number of synthetic cities
+    :return: list of country codes and cities
+    """
+    return [{"country": ReplayServer.SYNTHETIC_COUNTRY, "city": f"City{number}"} for number in range(city_count)]
+
+
+class ReplayServer(ThreadingHTTPServer):
+    """
+    A local stand-in server for the OpenWeatherMap geocoding and onecall APIs replaying a responses archive
+    ...
+
+    Attributes
+    ----------
+    archive : Dict[str, Dict]
+        recorded responses per location
+    latency : float
+        delay in seconds added to every response
+    error_rate : float
+        probability in range [0, 1] to respond with status code 500 instead of the recorded response
+    city_count : int
+        number of synthetic cities City0..City{city_count - 1} with country SYNTHETIC_COUNTRY, served in addition
+        to the recorded locations by cycling through the recorded responses
+    Methods
+    -------
+    geocode:
+        Get the geocoding response for a location query
+    onecall:
+        Get the weather forecast response for coordinates returned by geocode
+    """
+
+    SYNTHETIC_COUNTRY = "XX"
+    request_queue_size = 128
+
+    def __init__(
+            self,
+            archive: Dict[str, Dict],
+            host: str = "127.0.0.1",
+            port: int = 0,
+            latency: float = 0.0,
+            error_rate: float = 0.0,
+            city_count: int = 0,
+            seed: int = None):
+        super().__init__((host, port), ReplayRequestHandler)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.city_count = city_count
+        self.random = random.Random(seed)
+        self.random_lock = threading.Lock()
+        # Index the recorded responses by location query and by coordinates
+        self.archive = {
+            key: value for key, value in archive.items() if value.get("GeocodeAPI") and value.get("WeatherAPI")
+        }
+        self.records = list(self.archive.values())
+        self.coordinates = {}
+        for record in self.records:
+            geocode = record["GeocodeAPI"][0]
+            self.coordinates[self.coordinates_key(geocode.get("lat"), geocode.get("lon"))] = record["WeatherAPI"]
+
+    @property
+    def url(self) -> str:
+        """
+        :return: base url of the server, e.g. http://127.0.0.1:8000
+        """
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @staticmethod
+    def coordinates_key(lat, lon) -> Tuple[float, float]:
+        return round(float(lat), 6), round(float(lon), 6)
+
+    def fail(self) -> bool:
+        """
+        :return: True when the current request should fail according to the error rate
+        """
+        if not self.error_rate:
+            return False
+        with self.random_lock:
+            return self.random.random() < self.error_rate
+
+    def geocode(self, query: str) -> List[Dict]:
+        """
+        Get the geocoding response for a location query, an empty list for unknown locations like the real API
+        :param query: location query in the form '<city>,<country>'
+        :return: list with the geocoded location
+        """
+        city, _, country = query.partition(",")
+        record = self.archive.get(query) or self.archive.get(city)
+        if record:
+            return record["GeocodeAPI"]
+
+        # Synthetic cities get distinct coordinates next to the recorded location they are replaying
+        number = city[len("City"):]
+        if country != self.SYNTHETIC_COUNTRY or not city.startswith("City") or not number.isdigit():
+            return []
+        number = int(number)
+        if number >= self.city_count or not self.records:
+            return []
+        record = self.records[number % len(self.records)]
+        geocode = dict(record["GeocodeAPI"][0], name=city, country=country)
+        geocode["lat"] = round(geocode["lat"] + (number + 1) * 1e-5, 6)
+        self.coordinates.setdefault(self.coordinates_key(geocode["lat"], geocode["lon"]), record["WeatherAPI"])
+        return [geocode]
+
+    def onecall(self, lat: str, lon: str) -> Dict:
+        """
+        Get the weather forecast response for coordinates returned by geocode
+        :param lat: latitude
+        :param lon: longitude
+        :return: the recorded weather forecast response, None for unknown coordinates
+        """
+        return self.coordinates.get(self.coordinates_key(lat, lon))
+
+
+class ReplayRequestHandler(BaseHTTPRequestHandler):
+    """
+    A request handler serving the ReplayServer geocoding and onecall endpoints
+    """
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        if self.server.fail():
+            self.send_json(status=500, body={"cod": 500, "message": "Replay server error"})
+        elif url.path == GEOCODE_PATH and "q" in params:
+            self.send_json(status=200, body=self.server.geocode(query=params["q"]))
+        elif url.path == ONECALL_PATH and "lat" in params and "lon" in params:
+            response = self.server.onecall(lat=params["lat"], lon=params["lon"])
+            if response is None:
+                self.send_json(status=400, body={"cod": "400", "message": "wrong latitude or longitude"})
+            else:
+                self.send_json(status=200, body=response)
+        else:
+            self.send_json(status=404, body={"cod": "404", "message": "Not found"})
+
+    def send_json(self, status: int, body) -> None:
+        content = json.dumps(body, separators=(",", ":")).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args) -> None:
+        # Keep the request log out of stderr, it would dominate the output of load tests
+        logger.debug("%s - " + format, self.address_string(), *args)
@@ -1,29 +1,61 @@
 import os
 import csv
 import json
+import shutil
 import requests
-import logging
 import pandas as pd
 from datetime import datetime
-from typing import List, Dict
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Iterable, Iterator, Tuple, Union
 
-# Logger setup
-logger = logging.getLogger()
-logging.basicConfig(
-    filename="weather_forecast_logs.log", format='%(asctime)s:%(levelname)s:%(message)s', level=logging.DEBUG
+from logging_config import logger, start_worker_logging, stop_worker_logging, init_worker_logging, \
+    get_worker_logging_args
+from validation import WEATHER_SCHEMA, REJECT_REASON_COLUMN, validate_weather_data, get_quarantine_file_path, \
+    write_quarantine
+
+# Retry policy of the API calls, the server errors, rate limits and connection errors are retried up to 3 times
+# waiting 0, 0.5 and 1 seconds before the retries, the Retry-After header of the rate limited responses is respected
+API_RETRY = Retry(
+    total=3,
+    backoff_factor=0.25,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=("GET",),
+    raise_on_status=False
 )
 
+_session = None
+_session_pid = None
+
+
+def get_session() -> requests.Session:
+    """
+    Get the HTTP session of the current process, the connections to the API are reused between the API calls and
+    the failed calls are retried with the API_RETRY policy. Forked worker processes create their own session instead
+    of sharing the connections of the parent process.
+    :return: HTTP session
+    """
+    global _session, _session_pid
+    if _session is None or _session_pid != os.getpid():
+        _session = requests.Session()
+        adapter = HTTPAdapter(max_retries=API_RETRY)
+        _session.mount("http://", adapter)
+        _session.mount("https://", adapter)
+        _session_pid = os.getpid()
+    return _session
+
 
 def get_data(api: str, payload: dict) -> dict:
     """
-    Fetch data from API call
+    Fetch data from API call, retrying the server errors, rate limits and connection errors
     :param api: API call url
     :param payload: payload parameters for the API call
     :return: A dictionary with the API call response
     """
-    response = requests.get(api, params=payload)
+    response = get_session().get(api, params=payload)
     if response.status_code == 200:
-        logger.info(f"Successfully fetched the data from API call: {response.url}")
+        logger.info("Successfully fetched the data from API call: %s", response.url)
         return response.json()
     else:
         error_msg = f"Error: {response.status_code}. Failed to fetch data from API call {response.url}"
@@ -48,9 +80,7 @@ def read_csv(file_path: str) -> pd.DataFrame:
     """
     function_name = read_csv.__name__
     try:
-        logger.info(
-            f"Calling function {function_name} on file {file_path}."
-        )
+        logger.info("Calling function %s on file %s.", function_name, file_path)
         df = pd.read_csv(filepath_or_buffer=file_path, header=0, low_memory=False)
     except Exception as error:
         error_msg = f"Error occurred in {function_name} function: {error}"
@@ -58,55 +88,135 @@ def read_csv(file_path: str) -> pd.DataFrame:
         raise Exception(error_msg)
 
     logger.info(
-        f"The {function_name} function finished successfully. Data frame created from CSV file: {file_path}"
+        "The %s function finished successfully. Data frame created from CSV file: %s", function_name, file_path
     )
     return df
 
 
+def read_locations_file(file_path: str) -> Iterator[Dict]:
+    """
+    Stream the locations from a CSV or JSONL file, one location at a time
+    :param file_path: locations file path, CSV with 'country' and 'city' header columns or JSONL with one
+    {"country": ..., "city": ...} object per line
+    :return: Iterator over the location dictionaries
+    """
+    function_name = read_locations_file.__name__
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension not in (".csv", ".jsonl"):
+        error_msg = f"Error occurred in {function_name} function: unsupported locations file format {extension}"
+        logger.error(error_msg)
+        raise ValueError(error_msg)
+
+    logger.info("Calling function %s on file %s", function_name, file_path)
+    with open(file_path, "r", encoding="utf-8", newline="") as f:
+        if extension == ".csv":
+            for row in csv.DictReader(f):
+                yield {"country": row.get("country"), "city": row.get("city")}
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def iter_locations(locations: Union[str, Iterable[Dict]]) -> Iterator[Dict]:
+    """
+    Iterate over the locations from either a locations file path or an iterable of location dictionaries
+    :param locations: locations file path (CSV/JSONL) or iterable of country codes and cities
+    :return: Iterator over the location dictionaries
+    """
+    if isinstance(locations, str):
+        return read_locations_file(file_path=locations)
+    return iter(locations)
+
+
+def parse_shard(shard: str) -> Tuple[int, int]:
+    """
+    Parse a shard specification in the form 'i/N', where i is the zero-based shard index and N the shard count
+    :param shard: shard specification string, e.g. '0/4'
+    :return: A tuple with the shard index and the shard count
+    """
+    error_msg = f"Invalid shard {shard}, please specify the shard as 'i/N' with i in range [0, N - 1], e.g. '0/4'"
+    try:
+        shard_index, shard_count = (int(value) for value in shard.split("/"))
+    except ValueError:
+        logger.error(error_msg)
+        raise ValueError(error_msg)
+    if shard_count < 1 or not 0 <= shard_index < shard_count:
+        logger.error(error_msg)
+        raise ValueError(error_msg)
+    return shard_index, shard_count
+
+
+def shard_locations(locations: Iterable[Dict], shard_index: int, shard_count: int) -> Iterator[Dict]:
+    """
+    Select the locations belonging to a shard. The locations are partitioned round-robin by their position,
+    so every location is assigned to exactly one of the shard_count shards.
+    :param locations: iterable of country codes and cities
+    :param shard_index: zero-based shard index
+    :param shard_count: total number of shards
+    :return: Iterator over the locations of the shard
+    """
+    for position, location in enumerate(locations):
+        if position % shard_count == shard_index:
+            yield location
+
+
+def get_shard_file_path(file: str, shard_index: int, shard_count: int) -> str:
+    """
+    Get the partial CSV file path written by a shard, e.g. weather.csv -> weather.part-0-of-4.csv
+    :param file: CSV file path of the merged weather data
+    :param shard_index: zero-based shard index
+    :param shard_count: total number of shards
+    :return: CSV file path of the shard
+    """
+    root, extension = os.path.splitext(file)
+    return f"{root}.part-{shard_index}-of-{shard_count}{extension}"
+
+
 def extract_weather_data_to_csv(
         file: str,
-        locations_list: List[Dict],
+        locations_list: Iterable[Dict],
         weather_api: str,
         geo_api: str,
         appid: str) -> None:
     """
-    Extract weather forecast data from the OpenWeatherMap API and save it to CSV file
+    Extract weather forecast data from the OpenWeatherMap API and save it to CSV file. Duplicated locations are
+    skipped, the rows failing validate_weather_data and the locations not found by the geocoding API are written to
+    the quarantine CSV file next to the CSV file instead of failing the extraction.
     :param file: CSV file path
-    :param locations_list: list of country codes and cities which weather data will be extracted
+    :param locations_list: iterable of country codes and cities which weather data will be extracted
     :param weather_api: weather forecast OpenWeatherMap API url
     :param geo_api: geocoding OpenWeatherMap API url
     :param appid: OpenWeatherMap API key
     """
     function_name = extract_weather_data_to_csv.__name__
-    logger.info(f"Calling function {function_name} on file {file}")
-    fieldnames = [
-        "hours_forecast",
-        "datetime",
-        "country",
-        "city",
-        "temp",
-        "temp_feels_like",
-        "weather",
-        "weather_description",
-        "pop",
-        "wind_speed_m_s",
-        "clouds_percentage",
-        "pressure_level",
-        "humidity_percentage",
-    ]
+    logger.info("Calling function %s on file %s", function_name, file)
     data = []
+    not_found_locations = []
+    extracted_locations = set()
 
     try:
         for location in locations_list:
             # Geocoding API
             city = location.get("city")
             country = location.get("country")
+            # Skip the duplicated locations, their rows would be counted twice in the aggregates
+            if (country, city) in extracted_locations:
+                logger.warning("Skipping duplicated location %s,%s", city, country)
+                continue
+            extracted_locations.add((country, city))
             geo_api_payload = {
                 "q": f"{city},{country}",
                 "limit": 1,
                 "appid": appid
             }
             geo_api_response = get_data(api=geo_api, payload=geo_api_payload)
+            if not geo_api_response:
+                logger.warning("Location %s,%s not found by the geocoding API", city, country)
+                not_found_locations.append(
+                    {"country": country, "city": city, REJECT_REASON_COLUMN: "location not found"}
+                )
+                continue
 
             # Weather forecast API
             weather_api_payload = {
@@ -121,17 +231,20 @@ def extract_weather_data_to_csv(
             # Integer for hours_forecast column
             hours_forecast = 1
 
-            for hour_dict in weather_api_response.get("hourly"):
+            for hour_dict in weather_api_response.get("hourly", []):
+                # Hours without weather conditions or timestamp are kept for the validation to reject them
+                weather = (hour_dict.get("weather") or [{}])[0]
+                timestamp = hour_dict.get("dt")
                 data.append(
                     {
                         "hours_forecast": hours_forecast,
-                        "datetime": convert_timestamp(hour_dict.get("dt")),
+                        "datetime": convert_timestamp(timestamp) if timestamp is not None else None,
                         "country": country,
                         "city": city,
                         "temp": hour_dict.get("temp"),
                         "temp_feels_like": hour_dict.get("feels_like"),
-                        "weather": hour_dict.get("weather")[0].get("main"),
-                        "weather_description": hour_dict.get("weather")[0].get("description"),
+                        "weather": weather.get("main"),
+                        "weather_description": weather.get("description"),
                         "pop": hour_dict.get("pop"),
                         "wind_speed_m_s": hour_dict.get("wind_speed"),
                         "clouds_percentage": hour_dict.get("clouds"),
@@ -141,18 +254,155 @@ def extract_weather_data_to_csv(
                 )
                 hours_forecast += 1
 
-        with open(file, "w", encoding="UTF8", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(data)
+        # Validate the rows, the rejected rows and locations are written to the quarantine file
+        valid_df, rejected_df = validate_weather_data(pd.DataFrame(data=data, columns=list(WEATHER_SCHEMA)))
+        if not_found_locations:
+            rejected_df = pd.concat([rejected_df, pd.DataFrame(data=not_found_locations)], ignore_index=True)
+        valid_df.to_csv(file, index=False)
+        write_quarantine(rejected_df=rejected_df, file=get_quarantine_file_path(file))
 
-        logger.info(f"The {function_name} function finished successfully. Weather data extracted to CSV file: {file}")
+        logger.info(
+            "The %s function finished successfully. Weather data extracted to CSV file: %s", function_name, file
+        )
     except Exception as error:
         error_msg = f"Error occurred in {extract_weather_data_to_csv.__name__} function: {error}"
         logger.error(error_msg)
         raise Exception(error_msg)
 
 
+def extract_weather_data_shard(
+        file: str,
+        locations: Union[str, Iterable[Dict]],
+        weather_api: str,
+        geo_api: str,
+        appid: str,
+        shard_index: int,
+        shard_count: int) -> str:
+    """
+    Extract the weather forecast data for a single shard of the locations and save it to the shard's partial CSV file
+    :param file: CSV file path of the merged weather data, the shard file path is derived from it
+    :param locations: locations file path (CSV/JSONL) or iterable of country codes and cities
+    :param weather_api: weather forecast OpenWeatherMap API url
+    :param geo_api: geocoding OpenWeatherMap API url
+    :param appid: OpenWeatherMap API key
+    :param shard_index: zero-based shard index
+    :param shard_count: total number of shards
+    :return: CSV file path of the shard
+    """
+    shard_file = get_shard_file_path(file=file, shard_index=shard_index, shard_count=shard_count)
+    extract_weather_data_to_csv(
+        file=shard_file,
+        locations_list=shard_locations(
+            locations=iter_locations(locations), shard_index=shard_index, shard_count=shard_count
+        ),
+        weather_api=weather_api,
+        geo_api=geo_api,
+        appid=appid
+    )
+    return shard_file
+
+
+def extract_weather_data_sharded(
+        file: str,
+        locations: Union[str, Iterable[Dict]],
+        weather_api: str,
+        geo_api: str,
+        appid: str,
+        processes: int) -> List[str]:
+    """
+    Extract the weather forecast data in parallel, one shard of the locations per worker process.
+    Every worker writes its own partial CSV file which could be combined with merge_shard_files.
+    :param file: CSV file path of the merged weather data, the shard file paths are derived from it
+    :param locations: locations file path (CSV/JSONL) or list of country codes and cities. A file path is
+    streamed by every worker on its own instead of sending the whole list to each process.
+    :param weather_api: weather forecast OpenWeatherMap API url
+    :param geo_api: geocoding OpenWeatherMap API url
+    :param appid: OpenWeatherMap API key
+    :param processes: number of worker processes, which is also the number of shards
+    :return: List with the CSV file paths of the shards, ordered by shard index
+    """
+    function_name = extract_weather_data_sharded.__name__
+    logger.info("Calling function %s on file %s with %s processes", function_name, file, processes)
+    if not isinstance(locations, str):
+        locations = list(locations)
+
+    # The workers log through a multiprocessing queue drained by a listener thread of this process
+    worker_queue, worker_listener = start_worker_logging()
+    try:
+        with ProcessPoolExecutor(
+                max_workers=processes,
+                initializer=init_worker_logging,
+                initargs=get_worker_logging_args(worker_queue)) as executor:
+            futures = [
+                executor.submit(
+                    extract_weather_data_shard,
+                    file=file,
+                    locations=locations,
+                    weather_api=weather_api,
+                    geo_api=geo_api,
+                    appid=appid,
+                    shard_index=shard_index,
+                    shard_count=processes
+                )
+                for shard_index in range(processes)
+            ]
+            shard_files = [future.result() for future in futures]
+    finally:
+        stop_worker_logging(worker_listener)
+
+    logger.info("The %s function finished successfully. Weather data extracted to %s", function_name, shard_files)
+    return shard_files
+
+
+def merge_csv_files(files: List[str], output_file: str) -> None:
+    """
+    Merge CSV files with identical headers into a single CSV file. The files are concatenated as raw bytes,
+    keeping only the header of the first file, so no parsing is done.
+    :param files: list of CSV file paths to be merged
+    :param output_file: merged CSV file path
+    """
+    function_name = merge_csv_files.__name__
+    logger.info("Calling function %s on files %s", function_name, files)
+    try:
+        with open(output_file, "wb") as output:
+            for file_number, file in enumerate(files):
+                with open(file, "rb") as f:
+                    header = f.readline()
+                    if file_number == 0:
+                        output.write(header)
+                    shutil.copyfileobj(f, output)
+    except Exception as error:
+        error_msg = f"Error occurred in {function_name} function: {error}"
+        logger.error(error_msg)
+        raise Exception(error_msg)
+
+    logger.info("The %s function finished successfully. Merged CSV file: %s", function_name, output_file)
+
+
+def merge_shard_files(file: str, shard_count: int) -> None:
+    """
+    Merge the partial CSV files of all shards into the CSV file and the quarantine files of the shards, where there
+    are any, into the quarantine file of the CSV file
+    :param file: CSV file path of the merged weather data
+    :param shard_count: total number of shards
+    """
+    shard_files = [
+        get_shard_file_path(file=file, shard_index=shard_index, shard_count=shard_count)
+        for shard_index in range(shard_count)
+    ]
+    merge_csv_files(files=shard_files, output_file=file)
+
+    shard_quarantine_files = [
+        get_quarantine_file_path(shard_file) for shard_file in shard_files
+        if os.path.exists(get_quarantine_file_path(shard_file))
+    ]
+    quarantine_file = get_quarantine_file_path(file)
+    if shard_quarantine_files:
+        merge_csv_files(files=shard_quarantine_files, output_file=quarantine_file)
+    elif os.path.exists(quarantine_file):
+        os.remove(quarantine_file)
+
+
 class ConfigParser:
     """
     A class for weather forecast configuration parser
@@ -170,6 +420,10 @@ class ConfigParser:
         geocoding OpenWeatherMap API url
     locations_list : List[Dict]
         list of country codes and cities which weather data will be extracted
+    locations_file : str
+        optional CSV/JSONL file path with the locations, used instead of locations_list when set
+    locations : Union[str, List[Dict]]
+        the locations source, either the locations file path or the locations list
     database : str
         SQL database engine url
     table_name : str
@@ -178,6 +432,8 @@ class ConfigParser:
         weather data CSV file path
     test_responses_json : str
         JSON file path for the unit test response mocking
+    responses_archive : str
+        responses archive file path for recording and replaying the OpenWeatherMap API responses
     Methods
     -------
     read_config_file:
@@ -192,15 +448,22 @@ class ConfigParser:
         self.weather_api = self.config_json.get("weather_api")
         self.geocode_api = self.config_json.get("geocode_api")
         self.locations_list = self.config_json.get("locations_list")
+        self.locations_file = self.config_json.get("locations_file")
+        if self.locations_file:
+            self.locations_file = os.path.abspath(self.locations_file)
+        self.locations = self.locations_file if self.locations_file else self.locations_list
         self.database = self.config_json.get("database")
         self.table_name = self.config_json.get("table_name")
         self.weather_data_csv = os.path.abspath(self.config_json.get("weather_data_csv"))
         self.test_responses_json = os.path.abspath(self.config_json.get("test_responses_json"))
+        self.responses_archive = self.config_json.get("responses_archive")
+        if self.responses_archive:
+            self.responses_archive = os.path.abspath(self.responses_archive)
 
     def read_config_file(self, env) -> dict:
         """
         Read the config.json file
-        :param env: A string indicating which config file to be used. It could be either 'main' or 'test'.
+        :param env: A string indicating which config file to be used. It could be 'main', 'test' or 'replay'.
         :return: JSON file with configuration
         """
         try:
@@ -218,3 +481,31 @@ class ConfigParser:
             raise Exception(error_msg)
 
         return config_json
+
+
+def extract_weather_data(config: ConfigParser, processes: int = 1) -> None:
+    """
+    Extract the weather forecast data for the configured locations from the OpenWeatherMap API to the weather CSV file
+    :param config: weather forecast configuration parser
+    :param processes: number of worker processes, with more than one process the locations are split into
+    shards extracted in parallel and the partial CSV and quarantine files are merged into the weather CSV and
+    quarantine files
+    """
+    if processes > 1:
+        extract_weather_data_sharded(
+            file=config.weather_data_csv,
+            locations=config.locations,
+            weather_api=config.weather_api,
+            geo_api=config.geocode_api,
+            appid=config.api_key,
+            processes=processes
+        )
+        merge_shard_files(file=config.weather_data_csv, shard_count=processes)
+    else:
+        extract_weather_data_to_csv(
+            file=config.weather_data_csv,
+            locations_list=iter_locations(config.locations),
+            weather_api=config.weather_api,
+            geo_api=config.geocode_api,
+            appid=config.api_key
+        )
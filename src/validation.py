@@ -0,0 +1,118 @@
+import os
+import numpy as np
+import pandas as pd
+from typing import Tuple
+from logging_config import logger
+
+# Weather data columns in CSV order mapped to the kind of values they hold
+WEATHER_SCHEMA = {
+    "hours_forecast": "numeric",
+    "datetime": "datetime",
+    "country": "string",
+    "city": "string",
+    "temp": "numeric",
+    "temp_feels_like": "numeric",
+    "weather": "string",
+    "weather_description": "string",
+    "pop": "numeric",
+    "wind_speed_m_s": "numeric",
+    "clouds_percentage": "numeric",
+    "pressure_level": "numeric",
+    "humidity_percentage": "numeric",
+}
+
+# Columns which must have a value in every row
+REQUIRED_COLUMNS = ["hours_forecast", "datetime", "country", "city", "temp", "weather"]
+
+# Accepted [min, max] value range per numeric column, missing values of the optional columns are accepted
+COLUMN_RANGES = {
+    "hours_forecast": (1, 48),
+    "temp": (-90, 60),
+    "temp_feels_like": (-100, 70),
+    "pop": (0, 1),
+    "wind_speed_m_s": (0, 120),
+    "clouds_percentage": (0, 100),
+    "pressure_level": (850, 1100),
+    "humidity_percentage": (0, 100),
+}
+
+# Columns identifying a row, rows repeating them are duplicates
+KEY_COLUMNS = ["country", "city", "hours_forecast"]
+
+REJECT_REASON_COLUMN = "reject_reason"
+
+
+def validate_weather_data(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Validate the weather data against the schema, the required columns and the column ranges and drop the duplicated
+    rows. Every check is a vectorized column operation, so clean data passes with a few comparisons per column.
+    :param df: Pandas data frame with weather data
+    :return: A tuple with the valid rows and the rejected rows with an additional reject_reason column
+    """
+    function_name = validate_weather_data.__name__
+    missing_columns = [column for column in WEATHER_SCHEMA if column not in df.columns]
+    if missing_columns:
+        error_msg = f"Error occurred in {function_name} function: missing columns {missing_columns}"
+        logger.error(error_msg)
+        raise ValueError(error_msg)
+
+    df = df[list(WEATHER_SCHEMA)]
+    reasons = np.full(len(df), None, dtype=object)
+
+    def reject(mask: np.ndarray, reason: str) -> None:
+        # Keep the first failing check as the reject reason of a row
+        mask = mask & pd.isna(reasons)
+        if mask.any():
+            reasons[mask] = reason
+
+    # Schema enforcement, numeric columns read from text are converted and unparsable values are rejected
+    for column, kind in WEATHER_SCHEMA.items():
+        if kind == "numeric" and not pd.api.types.is_numeric_dtype(df[column]):
+            converted = pd.to_numeric(df[column], errors="coerce")
+            reject((converted.isna() & df[column].notna()).to_numpy(), f"invalid {column}")
+            df = df.assign(**{column: converted})
+
+    for column in REQUIRED_COLUMNS:
+        reject(df[column].isna().to_numpy(), f"missing {column}")
+
+    for column, (min_value, max_value) in COLUMN_RANGES.items():
+        values = df[column].to_numpy(dtype=float, na_value=np.nan)
+        reject((values < min_value) | (values > max_value), f"{column} out of range [{min_value}, {max_value}]")
+
+    reject(df.duplicated(subset=KEY_COLUMNS, keep="first").to_numpy(), "duplicate")
+
+    rejected_mask = pd.notna(reasons)
+    if not rejected_mask.any():
+        return df, df.iloc[0:0].assign(**{REJECT_REASON_COLUMN: pd.Series(dtype=object)})
+
+    rejected_df = df[rejected_mask].assign(**{REJECT_REASON_COLUMN: reasons[rejected_mask]})
+    logger.warning(
+        "The %s function rejected %s of %s rows: %s",
+        function_name, len(rejected_df), len(df), rejected_df[REJECT_REASON_COLUMN].value_counts().to_dict()
+    )
+    return df[~rejected_mask], rejected_df
+
+
+def get_quarantine_file_path(file: str, stage: str = "quarantine") -> str:
+    """
+    Get the quarantine CSV file path of the rejected rows, e.g. weather.csv -> weather.quarantine.csv for the rows
+    rejected during the extraction or weather.load-quarantine.csv with stage 'load-quarantine' for the loading
+    :param file: CSV file path of the weather data
+    :param stage: file name suffix of the pipeline stage which rejected the rows
+    :return: CSV file path of the rejected rows
+    """
+    root, extension = os.path.splitext(file)
+    return f"{root}.{stage}{extension}"
+
+
+def write_quarantine(rejected_df: pd.DataFrame, file: str) -> None:
+    """
+    Write the rejected rows to the quarantine CSV file, the file is replaced and removed when there are no rejected
+    rows, so it always holds the rejects of the latest run
+    :param rejected_df: Pandas data frame with the rejected rows
+    :param file: quarantine CSV file path
+    """
+    if not rejected_df.empty:
+        rejected_df.to_csv(file, index=False)
+    elif os.path.exists(file):
+        os.remove(file)
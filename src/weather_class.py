@@ -1,6 +1,9 @@
 import pandas as pd
-from sqlalchemy import create_engine
-from utils import logger, read_csv, extract_weather_data_to_csv, ConfigParser
+from typing import List, Union
+from utils import logger, read_csv, extract_weather_data, ConfigParser
+from backends import get_backend
+from logging_config import sample_query_log
+from validation import WEATHER_SCHEMA, validate_weather_data, get_quarantine_file_path, write_quarantine
 
 
 class WeatherForecast:
@@ -12,18 +15,28 @@ class WeatherForecast:
     ----------
     config : dict
         config dictionary for weather forecast data
+    backend : DatabaseBackend
+        database backend for the loading and the queries, selected by the database url
     engine : str
-        SQL database engine
+        SQL database engine or connection of the backend
     weather_data: pd.Dataframe
-        Pandas data frame with weather forecast data
+        Pandas data frame with weather forecast data, None when the data is not loaded from the weather CSV file
     max_hours_forecast: int
         the maximum hour forecast value
+    METRICS: Dict[str, str]
+        metric names mapped to the methods calculating them
     Methods
     -------
+    load_weather_data:
+        Load the weather CSV file into the database table
+    get_metric:
+        Get a weather metric by its name for one or more forecasting periods
     get_distinct_weather:
         Get all distinct weather conditions in a certain period of time per city
     get_most_common_weather:
         Get the most common weather conditions in a certain period of time per city
+    get_mode:
+        Get the most common value of categorical columns in a certain period of time per city
     get_average_temp:
         Get the average temperature in a certain period of time per city
     get_highest_temp_city:
@@ -32,225 +45,329 @@ class WeatherForecast:
         Get the city with the highest daily temperature variation in a certain period of time
     get_strongest_wind_city:
         Get the city with the strongest wind in a certain period of time
+    read_sql_query:
+        Run a query against the database
+    get_max_hours_forecast:
+        Get the maximum hour forecast value stored in the database table
+    get_horizons:
+        Get the validated list of forecasting periods
+    horizons_cte:
+        Build the common table expressions with the forecasting periods shared by the queries
+    format_horizons_result:
+        Drop the horizon column of a query result when a single forecasting period is requested
     check_hours_forecast:
         Check if the hours forecasting period is in the accepted range, [1, {self.max_hours_forecast}]
     """
 
-    def __init__(self, test: bool = False):
-        # Set config attribute for the file paths configuration for main or test env
+    METRICS = {
+        "distinct_weather": "get_distinct_weather",
+        "most_common_weather": "get_most_common_weather",
+        "average_temp": "get_average_temp",
+        "highest_temp_city": "get_highest_temp_city",
+        "highest_temp_variation_city": "get_highest_temp_variation_city",
+        "strongest_wind_city": "get_strongest_wind_city",
+    }
+
+    def __init__(
+            self,
+            test: bool = False,
+            extract: bool = True,
+            load: bool = True,
+            processes: int = 1,
+            env: str = "main",
+            database: str = None):
+        """
+        :param test: use the test configuration, the test weather data is never extracted from the API
+        :param extract: extract the weather data from the OpenWeatherMap API before loading the weather CSV file
+        :param load: load the weather CSV file into the database, otherwise the already stored table is queried
+        :param processes: number of worker processes for the extraction, each one extracting a shard of the locations
+        :param env: config file used when not testing, 'main' or 'replay' for the local stand-in API server
+        :param database: database url overriding the config database, e.g. duckdb:///weather_db.duckdb
+        """
+        # Set config attribute for the file paths configuration for main, replay or test env
         if not test:
-            self.config = ConfigParser(env="main")
+            self.config = ConfigParser(env=env)
             # Extract the weather data from the OpenWeatherMap API
-            extract_weather_data_to_csv(
-                file=self.config.weather_data_csv,
-                locations_list=self.config.locations_list,
-                weather_api=self.config.weather_api,
-                geo_api=self.config.geocode_api,
-                appid=self.config.api_key
-            )
+            if extract:
+                extract_weather_data(config=self.config, processes=processes)
         else:
             self.config = ConfigParser(env="test")
 
-        # Create the db engine
-        self.engine = create_engine(url=self.config.database)
-        # Create data frame from the weather csv
-        self.weather_data = read_csv(self.config.weather_data_csv)
+        # Create the db backend
+        self.backend = get_backend(url=database if database else self.config.database)
+        self.engine = self.backend.engine
+        if load:
+            self.load_weather_data()
+        else:
+            self.weather_data = None
+            self.max_hours_forecast = self.get_max_hours_forecast()
+
+    def load_weather_data(self) -> None:
+        """
+        Load the weather CSV file into the database table, if the table exists it is dropped and replaced
+        """
+        # Create data frame from the weather csv, the duplicated rows of merged shards and the invalid rows are
+        # written to the load quarantine file, replaced on every load
+        quarantine_file = get_quarantine_file_path(self.config.weather_data_csv, stage="load-quarantine")
+        self.weather_data, rejected_df = validate_weather_data(read_csv(self.config.weather_data_csv))
+        write_quarantine(rejected_df=rejected_df, file=quarantine_file)
+        if self.weather_data.empty:
+            error_msg = f"The {self.__class__.__name__} method {self.load_weather_data.__name__} failed. " \
+                        f"No valid rows in {self.config.weather_data_csv}, the rejected rows are written to " \
+                        f"{quarantine_file}"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
         # Get the max hours forecast value
         self.max_hours_forecast = self.weather_data["hours_forecast"].max()
         # Store the weather data frame as table (if table exists it is dropped and replaced)
-        self.weather_data.to_sql(name=self.config.table_name, con=self.engine, if_exists="replace")
+        self.backend.load_dataframe(df=self.weather_data, table_name=self.config.table_name)
+
+    def get_metric(self, metric: str, hours_forecast: Union[int, List[int]] = None) -> pd.DataFrame:
+        """
+        Get a weather metric by its name for one or more forecasting periods
+        :param metric: metric name, one of the WeatherForecast.METRICS keys
+        :param hours_forecast: forecasting period in hours or list of periods, answered together in a single query
+        :return: Pandas data frame with the metric
+        """
+        if metric not in self.METRICS:
+            error_msg = f"The {self.__class__.__name__} method {self.get_metric.__name__} failed. " \
+                        f"Invalid metric {metric}, please specify one of {list(self.METRICS)}"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
 
-    def get_distinct_weather(self, hours_forecast: int = None) -> pd.DataFrame:
+        return getattr(self, self.METRICS[metric])(hours_forecast=hours_forecast)
+
+    def get_distinct_weather(self, hours_forecast: Union[int, List[int]] = None) -> pd.DataFrame:
         """
         Get all distinct weather conditions in a certain period of time per city
-        :param hours_forecast: forecasting period in hours, should be in range [1, {self.max_hours_forecast}]
+        :param hours_forecast: forecasting period in hours, should be in range [1, {self.max_hours_forecast}].
+        For a list of periods the result has a leading horizon column with the period of each row.
         :return: Pandas data frame with distinct weather conditions per city
         """
-        hours_forecast = self.max_hours_forecast if not hours_forecast else hours_forecast
-        self.check_hours_forecast(hours_forecast=hours_forecast)
+        horizons = self.get_horizons(hours_forecast=hours_forecast)
         method_name = self.get_distinct_weather.__name__
         query = f"""
-            SELECT DISTINCT
+            {self.horizons_cte(horizons=horizons)}
+            SELECT
+                horizon,
                 city,
                 weather,
                 weather_description,
-                ROUND(COUNT(weather)/{float(hours_forecast)}*100, 0) AS percentage
-            FROM weather_table
-            WHERE hours_forecast <= {hours_forecast}
-            GROUP BY city, weather, weather_description
-            ORDER BY city, percentage DESC;
+                ROUND(COUNT(weather)/CAST(horizon AS DOUBLE PRECISION)*100, 0) AS percentage
+            FROM horizon_weather
+            GROUP BY horizon, city, weather, weather_description
+            ORDER BY horizon, city, percentage DESC, weather, weather_description;
         """
-        try:
-            logger.info(
-                f"Calling {self.__class__.__name__} method {method_name} with query: {query}"
-            )
-            df_query_result = pd.read_sql_query(sql=query, con=self.engine)
-        except Exception as error:
-            error_msg = f"Error occurred in {method_name} method: {error}"
-            logger.error(error_msg)
-            raise Exception(error_msg)
+        df_query_result = self.read_sql_query(query=query, method_name=method_name)
 
-        return df_query_result
+        return self.format_horizons_result(df_query_result=df_query_result, hours_forecast=hours_forecast)
 
-    def get_most_common_weather(self, hours_forecast: int = None) -> pd.DataFrame:
+    def get_most_common_weather(
+            self, hours_forecast: Union[int, List[int]] = None, ties: str = "first") -> pd.DataFrame:
         """
         Get the most common weather conditions in a certain period of time per city
-        :param hours_forecast: forecasting period in hours, should be in range [1, {self.max_hours_forecast}]
+        :param hours_forecast: forecasting period in hours, should be in range [1, {self.max_hours_forecast}].
+        For a list of periods the result has a leading horizon column with the period of each row.
+        :param ties: 'first' for a single weather condition per city, the alphabetically first one of the tied most
+        common conditions, or 'all' for all tied most common conditions
         :return: Pandas data frame with most common weather conditions per city
         """
-        hours_forecast = self.max_hours_forecast if not hours_forecast else hours_forecast
-        self.check_hours_forecast(hours_forecast=hours_forecast)
-        method_name = self.get_most_common_weather.__name__
+        df_mode = self.get_mode(columns=["weather", "weather_description"], hours_forecast=hours_forecast, ties=ties)
+
+        return df_mode.drop(columns="percentage")
+
+    def get_mode(
+            self,
+            columns: List[str],
+            hours_forecast: Union[int, List[int]] = None,
+            ties: str = "first") -> pd.DataFrame:
+        """
+        Get the most common value (mode) of categorical columns in a certain period of time per city. The values are
+        counted once per city and ranked with window functions, so ties are resolved deterministically.
+        :param columns: categorical columns, their value combination is counted, e.g. ["weather"]
+        :param hours_forecast: forecasting period in hours, should be in range [1, {self.max_hours_forecast}].
+        For a list of periods the result has a leading horizon column with the period of each row.
+        :param ties: 'first' for a single mode per city, the first one of the tied modes ordered by the columns,
+        or 'all' for all tied modes
+        :return: Pandas data frame with the mode and its percentage of the period per city
+        """
+        method_name = self.get_mode.__name__
+        categorical_columns = [column for column, kind in WEATHER_SCHEMA.items() if kind == "string"]
+        invalid_columns = [column for column in columns if column not in categorical_columns]
+        if not columns or invalid_columns or ties not in ("first", "all"):
+            error_msg = f"The {self.__class__.__name__} method {method_name} failed. " \
+                        f"Invalid columns {columns} or ties {ties}, please specify columns from " \
+                        f"{categorical_columns} and ties 'first' or 'all'"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        horizons = self.get_horizons(hours_forecast=hours_forecast)
+        columns_list = ", ".join(columns)
+        rank_filter = "value_row_number = 1" if ties == "first" else "value_rank = 1"
         query = f"""
-            SELECT
-                city,
-                weather,
-                weather_description
-            FROM (
-                SELECT DISTINCT
+            {self.horizons_cte(horizons=horizons)},
+            value_counts AS (
+                SELECT
+                    horizon,
                     city,
-                    weather,
-                    weather_description,
-                ROUND(COUNT(weather)/{float(hours_forecast)}*100, 0) AS percentage
-                FROM weather_table
-                WHERE hours_forecast <= {hours_forecast}
-                GROUP BY city, weather, weather_description
+                    {columns_list},
+                    COUNT(*) AS value_count
+                FROM horizon_weather
+                GROUP BY horizon, city, {columns_list}
+            ),
+            ranked_values AS (
+                SELECT
+                    value_counts.*,
+                    RANK() OVER (PARTITION BY horizon, city ORDER BY value_count DESC) AS value_rank,
+                    ROW_NUMBER() OVER (
+                        PARTITION BY horizon, city ORDER BY value_count DESC, {columns_list}
+                    ) AS value_row_number
+                FROM value_counts
             )
-            GROUP BY city
-            HAVING percentage == MAX(percentage);
+            SELECT
+                horizon,
+                city,
+                {columns_list},
+                ROUND(value_count/CAST(horizon AS DOUBLE PRECISION)*100, 0) AS percentage
+            FROM ranked_values
+            WHERE {rank_filter}
+            ORDER BY horizon, city, {columns_list};
         """
-        try:
-            logger.info(
-                f"Calling {self.__class__.__name__} method {method_name} with query: {query}"
-            )
-            df_query_result = pd.read_sql_query(sql=query, con=self.engine)
-        except Exception as error:
-            error_msg = f"Error occurred in {method_name} method: {error}"
-            logger.error(error_msg)
-            raise Exception(error_msg)
+        df_query_result = self.read_sql_query(query=query, method_name=method_name)
 
-        return df_query_result
+        return self.format_horizons_result(df_query_result=df_query_result, hours_forecast=hours_forecast)
 
-    def get_average_temp(self, hours_forecast: int = None) -> pd.DataFrame:
+    def get_average_temp(self, hours_forecast: Union[int, List[int]] = None) -> pd.DataFrame:
         """
         Get the average temperature in a certain period of time per city
-        :param hours_forecast: forecasting period in hours, should be in range [1, {self.max_hours_forecast}]
+        :param hours_forecast: forecasting period in hours, should be in range [1, {self.max_hours_forecast}].
+        For a list of periods the result has a leading horizon column with the period of each row.
         :return: Pandas data frame with average temperature per city
         """
-        hours_forecast = self.max_hours_forecast if not hours_forecast else hours_forecast
-        self.check_hours_forecast(hours_forecast=hours_forecast)
+        horizons = self.get_horizons(hours_forecast=hours_forecast)
         method_name = self.get_average_temp.__name__
         query = f"""
+            {self.horizons_cte(horizons=horizons)}
             SELECT
+                horizon,
                 city,
                 ROUND(AVG(temp), 2) AS average_temp
-            FROM weather_table
-            WHERE hours_forecast <= {hours_forecast}
-            GROUP BY city;
+            FROM horizon_weather
+            GROUP BY horizon, city
+            ORDER BY horizon, city;
         """
-        try:
-            logger.info(
-                f"Calling {self.__class__.__name__} method {method_name} with query: {query}"
-            )
-            df_query_result = pd.read_sql_query(sql=query, con=self.engine)
-        except Exception as error:
-            error_msg = f"Error occurred in {method_name} method: {error}"
-            logger.error(error_msg)
-            raise Exception(error_msg)
+        df_query_result = self.read_sql_query(query=query, method_name=method_name)
 
-        return df_query_result
+        return self.format_horizons_result(df_query_result=df_query_result, hours_forecast=hours_forecast)
 
-    def get_highest_temp_city(self, hours_forecast: int = None) -> pd.DataFrame:
+    def get_highest_temp_city(self, hours_forecast: Union[int, List[int]] = None) -> pd.DataFrame:
         """
         Get the city with highest absolute temperature in a certain period of time
-        :param hours_forecast: forecasting period in hours, should be in range [1, {self.max_hours_forecast}]
+        :param hours_forecast: forecasting period in hours, should be in range [1, {self.max_hours_forecast}].
+        For a list of periods the result has a leading horizon column with the period of each row.
         :return: Pandas data frame with highest temperature city
         """
-        hours_forecast = self.max_hours_forecast if not hours_forecast else hours_forecast
-        self.check_hours_forecast(hours_forecast=hours_forecast)
+        horizons = self.get_horizons(hours_forecast=hours_forecast)
         method_name = self.get_highest_temp_city.__name__
         query = f"""
+            {self.horizons_cte(horizons=horizons)}
             SELECT
+                horizon_weather.horizon,
                 datetime,
                 city,
                 temp AS highest_temp
-            FROM weather_table
-            WHERE hours_forecast <= {hours_forecast}
-            AND temp = (SELECT MAX(temp) FROM weather_table WHERE hours_forecast <= {hours_forecast});
+            FROM horizon_weather
+            JOIN (
+                SELECT horizon, MAX(temp) AS max_temp FROM horizon_weather GROUP BY horizon
+            ) AS horizon_max ON horizon_weather.horizon = horizon_max.horizon AND temp = max_temp
+            ORDER BY horizon_weather.horizon, datetime, city;
         """
-        try:
-            logger.info(
-                f"Calling {self.__class__.__name__} method {method_name} with query: {query}"
-            )
-            df_query_result = pd.read_sql_query(sql=query, con=self.engine)
-        except Exception as error:
-            error_msg = f"Error occurred in {method_name} method: {error}"
-            logger.error(error_msg)
-            raise Exception(error_msg)
+        df_query_result = self.read_sql_query(query=query, method_name=method_name)
 
-        return df_query_result
+        return self.format_horizons_result(df_query_result=df_query_result, hours_forecast=hours_forecast)
 
-    def get_highest_temp_variation_city(self, hours_forecast: int = None) -> pd.DataFrame:
+    def get_highest_temp_variation_city(self, hours_forecast: Union[int, List[int]] = None) -> pd.DataFrame:
         """
-        Get the city with the highest daily temperature variation in a certain period of time
-        :param hours_forecast: forecasting period in hours, should be in range [1, {self.max_hours_forecast}]
+        Get the city with the highest daily temperature variation in a certain period of time, all tied cities are
+        returned
+        :param hours_forecast: forecasting period in hours, should be in range [1, {self.max_hours_forecast}].
+        For a list of periods the result has a leading horizon column with the period of each row.
         :return: Pandas data frame with the highest temperature variation city
         """
-        hours_forecast = self.max_hours_forecast if not hours_forecast else hours_forecast
-        self.check_hours_forecast(hours_forecast=hours_forecast)
+        horizons = self.get_horizons(hours_forecast=hours_forecast)
         method_name = self.get_highest_temp_variation_city.__name__
         query = f"""
-            SELECT
-                city,
-                MAX(temp_variation) AS highest_temp_variation,
-                max_temp,
-                min_temp
-            FROM (
+            {self.horizons_cte(horizons=horizons)},
+            city_variations AS (
                 SELECT
+                    horizon,
                     city,
                     MAX(temp) as max_temp,
                     MIN(temp) as min_temp,
                     (MAX(temp) - MIN(temp)) AS temp_variation
-                FROM weather_table
-                WHERE hours_forecast <= {hours_forecast}
-                GROUP BY city
-            );
-        """
-        try:
-            logger.info(
-                f"Calling {self.__class__.__name__} method {method_name} with query: {query}"
+                FROM horizon_weather
+                GROUP BY horizon, city
+            ),
+            ranked_variations AS (
+                SELECT
+                    city_variations.*,
+                    RANK() OVER (PARTITION BY horizon ORDER BY temp_variation DESC) AS variation_rank
+                FROM city_variations
             )
-            df_query_result = pd.read_sql_query(sql=query, con=self.engine)
-        except Exception as error:
-            error_msg = f"Error occurred in {method_name} method: {error}"
-            logger.error(error_msg)
-            raise Exception(error_msg)
+            SELECT
+                horizon,
+                city,
+                temp_variation AS highest_temp_variation,
+                max_temp,
+                min_temp
+            FROM ranked_variations
+            WHERE variation_rank = 1
+            ORDER BY horizon, city;
+        """
+        df_query_result = self.read_sql_query(query=query, method_name=method_name)
 
-        return df_query_result
+        return self.format_horizons_result(df_query_result=df_query_result, hours_forecast=hours_forecast)
 
-    def get_strongest_wind_city(self, hours_forecast: int = None) -> pd.DataFrame:
+    def get_strongest_wind_city(self, hours_forecast: Union[int, List[int]] = None) -> pd.DataFrame:
         """
         Get the city with the strongest wind in a certain period of time
-        :param hours_forecast: forecasting period in hours, should be in range [1, {self.max_hours_forecast}]
+        :param hours_forecast: forecasting period in hours, should be in range [1, {self.max_hours_forecast}].
+        For a list of periods the result has a leading horizon column with the period of each row.
         :return: Pandas data frame with the strongest wind city
         """
-        hours_forecast = self.max_hours_forecast if not hours_forecast else hours_forecast
-        self.check_hours_forecast(hours_forecast=hours_forecast)
+        horizons = self.get_horizons(hours_forecast=hours_forecast)
         method_name = self.get_strongest_wind_city.__name__
         query = f"""
+            {self.horizons_cte(horizons=horizons)}
             SELECT
+                horizon_weather.horizon,
                 datetime,
                 city,
                 wind_speed_m_s
-            FROM weather_table
-            WHERE hours_forecast <= {hours_forecast}
-            AND wind_speed_m_s = (SELECT MAX(wind_speed_m_s) FROM weather_table WHERE hours_forecast <= {hours_forecast});
+            FROM horizon_weather
+            JOIN (
+                SELECT horizon, MAX(wind_speed_m_s) AS max_wind_speed FROM horizon_weather GROUP BY horizon
+            ) AS horizon_max ON horizon_weather.horizon = horizon_max.horizon AND wind_speed_m_s = max_wind_speed
+            ORDER BY horizon_weather.horizon, datetime, city;
+        """
+        df_query_result = self.read_sql_query(query=query, method_name=method_name)
+
+        return self.format_horizons_result(df_query_result=df_query_result, hours_forecast=hours_forecast)
+
+    def read_sql_query(self, query: str, method_name: str) -> pd.DataFrame:
+        """
+        Run a query against the database. The query log record is sampled, see logging_config.sample_query_log.
+        :param query: SQL query
+        :param method_name: name of the calling method, used in the log records and error messages
+        :return: Pandas data frame with the query result
         """
         try:
-            logger.info(
-                f"Calling {self.__class__.__name__} method {method_name} with query: {query}"
-            )
-            df_query_result = pd.read_sql_query(sql=query, con=self.engine)
+            if sample_query_log():
+                logger.info(
+                    "Calling %s method %s with query: %s", self.__class__.__name__, method_name, query,
+                    extra={"method": method_name}
+                )
+            df_query_result = self.backend.read_sql_query(query=query)
         except Exception as error:
             error_msg = f"Error occurred in {method_name} method: {error}"
             logger.error(error_msg)
@@ -258,6 +375,63 @@ class WeatherForecast:
 
         return df_query_result
 
+    def get_max_hours_forecast(self) -> int:
+        """
+        Get the maximum hour forecast value stored in the database table
+        :return: the maximum hour forecast value
+        """
+        method_name = self.get_max_hours_forecast.__name__
+        query = f"SELECT MAX(hours_forecast) AS max_hours_forecast FROM {self.config.table_name};"
+        df_query_result = self.read_sql_query(query=query, method_name=method_name)
+        return int(df_query_result["max_hours_forecast"].iloc[0])
+
+    def get_horizons(self, hours_forecast: Union[int, List[int]] = None) -> List[int]:
+        """
+        Get the validated list of forecasting periods, defaulting to the maximum hour forecast value
+        :param hours_forecast: forecasting period in hours or list of periods
+        :return: List with the distinct forecasting periods in ascending order
+        """
+        if isinstance(hours_forecast, (list, tuple)):
+            if not hours_forecast:
+                error_msg = f"The {self.__class__.__name__} method {self.get_horizons.__name__} failed. " \
+                            f"Empty hours forecast list, please specify at least one forecasting period"
+                logger.error(error_msg)
+                raise ValueError(error_msg)
+            horizons = sorted(set(hours_forecast))
+        else:
+            horizons = [self.max_hours_forecast if not hours_forecast else hours_forecast]
+        for horizon in horizons:
+            self.check_hours_forecast(hours_forecast=horizon)
+        return [int(horizon) for horizon in horizons]
+
+    def horizons_cte(self, horizons: List[int]) -> str:
+        """
+        Build the common table expressions shared by the queries. The horizons table holds the forecasting periods
+        and horizon_weather the weather table rows joined with every period they belong to, so that all periods
+        are answered in a single query.
+        :param horizons: validated list of forecasting periods
+        :return: WITH clause of the query
+        """
+        horizons_values = ", ".join(f"({horizon})" for horizon in horizons)
+        return f"""WITH horizons(horizon) AS (VALUES {horizons_values}),
+            horizon_weather AS (
+                SELECT horizons.horizon, {self.config.table_name}.*
+                FROM {self.config.table_name}
+                JOIN horizons ON {self.config.table_name}.hours_forecast <= horizons.horizon
+            )"""
+
+    @staticmethod
+    def format_horizons_result(df_query_result: pd.DataFrame, hours_forecast: Union[int, List[int]]) -> pd.DataFrame:
+        """
+        Drop the horizon column of a query result when a single forecasting period is requested
+        :param df_query_result: query result with a horizon column
+        :param hours_forecast: forecasting period in hours or list of periods
+        :return: Pandas data frame with the query result
+        """
+        if isinstance(hours_forecast, (list, tuple)):
+            return df_query_result
+        return df_query_result.drop(columns="horizon")
+
     def check_hours_forecast(self, hours_forecast: int) -> None:
         """
         Check if the hours forecasting period is in the accepted range, [1, {self.max_hours_forecast}]
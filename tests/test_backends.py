@@ -0,0 +1,54 @@
+import pytest
+import sqlite3
+from pandas.testing import assert_frame_equal
+from src.utils import ConfigParser, read_csv
+from src.backends import SQLiteBackend, get_backend
+from src.weather_class import WeatherForecast
+
+
+def test_sqlite_backend(tmp_path):
+    """
+    Testing the SQLiteBackend bulk load and WAL journal mode
+    """
+    config = ConfigParser(env="test")
+    weather_df = read_csv(file_path=config.weather_data_csv)
+    backend = get_backend(url=f"sqlite:///{tmp_path / 'weather_db.db'}")
+
+    backend.load_dataframe(df=weather_df, table_name=config.table_name)
+    backend.load_dataframe(df=weather_df, table_name=config.table_name)
+
+    assert isinstance(backend, SQLiteBackend)
+    assert_frame_equal(weather_df, backend.read_sql_query(query=f"SELECT * FROM {config.table_name}"))
+    assert backend.read_sql_query(query="PRAGMA journal_mode")["journal_mode"][0] == "wal"
+
+
+def test_sqlite_backend_failed_load(tmp_path):
+    """
+    Testing the SQLiteBackend keeps the previous rows when a load fails while inserting the rows
+    """
+    config = ConfigParser(env="test")
+    weather_df = read_csv(file_path=config.weather_data_csv)
+    backend = get_backend(url=f"sqlite:///{tmp_path / 'weather_db.db'}")
+    backend.load_dataframe(df=weather_df, table_name=config.table_name)
+
+    with pytest.raises(sqlite3.Error):
+        backend.load_dataframe(df=weather_df.assign(city=object()), table_name=config.table_name)
+
+    assert_frame_equal(weather_df, backend.read_sql_query(query=f"SELECT * FROM {config.table_name}"))
+
+
+def test_duckdb_backend():
+    """
+    Testing the WeatherForecast metrics on the DuckDBBackend against the default SQLite backend
+    """
+    pytest.importorskip("duckdb")
+    sqlite_weather_forecast = WeatherForecast(test=True)
+    duckdb_weather_forecast = WeatherForecast(test=True, database="duckdb:///:memory:")
+
+    assert duckdb_weather_forecast.backend.name == "duckdb"
+    for metric in WeatherForecast.METRICS:
+        assert_frame_equal(
+            sqlite_weather_forecast.get_metric(metric=metric, hours_forecast=[1, 2, 3]),
+            duckdb_weather_forecast.get_metric(metric=metric, hours_forecast=[1, 2, 3]),
+            check_dtype=False
+        )
@@ -0,0 +1,78 @@
+import json
+import threading
+from src.utils import ConfigParser, extract_weather_data_sharded
+from src.replay import ReplayServer, GEOCODE_PATH, ONECALL_PATH, read_archive
+from src.weather_class import WeatherForecast
+# The logging state is held by the module imported by the application modules, not by its src.logging_config copy
+from logging_config import logger, configure_logging, stop_logging, sample_query_log
+
+
+def test_configure_logging(tmp_path):
+    """
+    Testing the configure_logging function for JSON records and sampled per-query records
+    """
+    weather_forecast_object = WeatherForecast(test=True)
+    log_file = tmp_path / "weather_forecast_logs.log"
+    configure_logging(file=str(log_file), level="INFO", json_format=True, query_sample_rate=0.0)
+
+    logger.info("Calling function %s on file %s", "read_csv", "weather.csv")
+    weather_forecast_object.get_average_temp(hours_forecast=3)
+    logger.error("Error occurred in %s method", "get_average_temp", extra={"method": "get_average_temp"})
+    logger.debug("Not logged at INFO level")
+    stop_logging()
+
+    log_records = [json.loads(line) for line in log_file.read_text().splitlines()]
+
+    assert [(record["level"], record["message"]) for record in log_records] == [
+        ("INFO", "Calling function read_csv on file weather.csv"),
+        ("ERROR", "Error occurred in get_average_temp method"),
+    ]
+    assert log_records[0]["logger"] == "weather_forecast"
+    assert log_records[1]["method"] == "get_average_temp"
+
+
+def test_sample_query_log(tmp_path):
+    """
+    Testing the sample_query_log function for the query sample rate and the logging level
+    """
+    configure_logging(file=str(tmp_path / "weather_forecast_logs.log"), level="INFO", query_sample_rate=1.0)
+    kept_all = all(sample_query_log() for _ in range(100))
+    configure_logging(file=str(tmp_path / "weather_forecast_logs.log"), level="INFO", query_sample_rate=0.0)
+    kept_none = not any(sample_query_log() for _ in range(100))
+    configure_logging(file=str(tmp_path / "weather_forecast_logs.log"), level="WARNING", query_sample_rate=1.0)
+    kept_warning = sample_query_log()
+    stop_logging()
+
+    assert kept_all and kept_none
+    assert not kept_warning
+
+
+def test_configure_logging_workers(tmp_path):
+    """
+    Testing that the records of the extract_weather_data_sharded worker processes reach the log file
+    """
+    config = ConfigParser(env="test")
+    server = ReplayServer(archive=read_archive(file_path=config.test_responses_json))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    log_file = tmp_path / "weather_forecast_logs.log"
+    configure_logging(file=str(log_file), level="INFO")
+
+    try:
+        extract_weather_data_sharded(
+            file=str(tmp_path / "weather.csv"),
+            locations=[{"country": "IT", "city": "Milan"}, {"country": "IT", "city": "Atlantis"}],
+            weather_api=server.url + ONECALL_PATH,
+            geo_api=server.url + GEOCODE_PATH,
+            appid=config.api_key,
+            processes=2
+        )
+    finally:
+        stop_logging()
+        server.shutdown()
+        server.server_close()
+
+    log_text = log_file.read_text()
+
+    assert "Weather data extracted to CSV file: " + str(tmp_path / "weather.part-0-of-2.csv") in log_text
+    assert "Location Atlantis,IT not found by the geocoding API" in log_text
+    assert "The extract_weather_data_sharded function finished successfully" in log_text
@@ -0,0 +1,94 @@
+import threading
+import pytest
+from src.utils import ConfigParser, get_data, extract_weather_data_to_csv, read_csv
+from src.validation import get_quarantine_file_path
+from src.replay import ReplayServer, GEOCODE_PATH, ONECALL_PATH, read_archive, write_archive, generate_locations
+
+
+@pytest.fixture
+def replay_server():
+    """
+    Start a replay server for the test responses in a background thread
+    """
+    config = ConfigParser(env="test")
+    server = ReplayServer(archive=read_archive(file_path=config.test_responses_json), city_count=4)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_write_archive(tmp_path):
+    """
+    Testing the write_archive and read_archive functions for a gzip compressed archive
+    """
+    config = ConfigParser(env="test")
+    archive = read_archive(file_path=config.test_responses_json)
+    archive_file = str(tmp_path / "responses.json.gz")
+
+    write_archive(file_path=archive_file, archive=archive)
+
+    assert read_archive(file_path=archive_file) == archive
+
+
+def test_replay_server(replay_server, tmp_path):
+    """
+    Testing the extract_weather_data_to_csv function against the ReplayServer for recorded, synthetic, duplicated
+    and unknown cities
+    """
+    weather_csv = str(tmp_path / "weather.csv")
+
+    extract_weather_data_to_csv(
+        file=weather_csv,
+        locations_list=[{"country": "IT", "city": "Bologna"}] + generate_locations(city_count=4) + [
+            {"country": "IT", "city": "Bologna"}, {"country": "IT", "city": "Atlantis"}
+        ],
+        weather_api=replay_server.url + ONECALL_PATH,
+        geo_api=replay_server.url + GEOCODE_PATH,
+        appid="test-api-key"
+    )
+    actual_df = read_csv(file_path=weather_csv)
+    quarantine_df = read_csv(file_path=get_quarantine_file_path(weather_csv))
+
+    assert actual_df["city"].unique().tolist() == ["Bologna", "City0", "City1", "City2", "City3"]
+    assert actual_df.groupby("city")["temp"].max().to_dict() == {
+        "Bologna": 8.36, "City0": 7.43, "City1": 8.36, "City2": 10.36, "City3": 7.43
+    }
+    assert quarantine_df[["city", "reject_reason"]].values.tolist() == [["Atlantis", "location not found"]]
+    assert get_data(api=replay_server.url + GEOCODE_PATH, payload={"q": "City4,XX"}) == []
+
+
+def test_replay_server_retries(replay_server, tmp_path):
+    """
+    Testing the extract_weather_data_to_csv function retries the server errors of the ReplayServer
+    """
+    weather_csv = str(tmp_path / "weather.csv")
+    replay_server.error_rate = 0.3
+    replay_server.random.seed(0)
+
+    extract_weather_data_to_csv(
+        file=weather_csv,
+        locations_list=[{"country": "IT", "city": "Bologna"}] + generate_locations(city_count=4),
+        weather_api=replay_server.url + ONECALL_PATH,
+        geo_api=replay_server.url + GEOCODE_PATH,
+        appid="test-api-key"
+    )
+
+    assert read_csv(file_path=weather_csv)["city"].unique().tolist() == ["Bologna", "City0", "City1", "City2", "City3"]
+    assert not (tmp_path / "weather.quarantine.csv").exists()
+
+
+def test_replay_server_errors(replay_server):
+    """
+    Testing the ReplayServer error rate and unknown coordinates
+    """
+    replay_server.error_rate = 1.0
+    with pytest.raises(Exception) as e:
+        get_data(api=replay_server.url + GEOCODE_PATH, payload={"q": "Milan,IT"})
+    assert str(e.value).startswith("Error: 500.")
+
+    replay_server.error_rate = 0.0
+    with pytest.raises(Exception) as e:
+        get_data(api=replay_server.url + ONECALL_PATH, payload={"lat": 0, "lon": 0})
+    assert str(e.value).startswith("Error: 400.")
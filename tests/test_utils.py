@@ -3,7 +3,8 @@ import pytest
 import responses
 import pandas as pd
 from pandas.testing import assert_frame_equal
-from src.utils import ConfigParser, get_data, extract_weather_data_to_csv, read_csv
+from src.utils import ConfigParser, get_data, extract_weather_data_to_csv, read_csv, read_locations_file, \
+    parse_shard, shard_locations, get_shard_file_path, merge_csv_files, merge_shard_files
 
 
 @responses.activate
@@ -154,4 +155,78 @@ def test_extract_weather_data_to_csv():
     assert_frame_equal(expected_df, actual_df)
 
 
+def test_read_locations_file(tmp_path):
+    """
+    Testing the read_locations_file function for CSV and JSONL locations files
+    """
+    csv_file = tmp_path / "locations.csv"
+    csv_file.write_text("country,city\nIT,Milan\nIT,Bologna\n")
+    jsonl_file = tmp_path / "locations.jsonl"
+    jsonl_file.write_text('{"country": "IT", "city": "Milan"}\n\n{"country": "IT", "city": "Bologna"}\n')
+
+    expected_locations = [{"country": "IT", "city": "Milan"}, {"country": "IT", "city": "Bologna"}]
+
+    assert list(read_locations_file(file_path=str(csv_file))) == expected_locations
+    assert list(read_locations_file(file_path=str(jsonl_file))) == expected_locations
+    with pytest.raises(ValueError):
+        list(read_locations_file(file_path=str(tmp_path / "locations.txt")))
+
+
+def test_shard_locations():
+    """
+    Testing the parse_shard and shard_locations functions
+    """
+    locations = [{"country": "IT", "city": f"City{number}"} for number in range(5)]
+
+    shards = [list(shard_locations(locations, shard_index, 2)) for shard_index in range(2)]
+
+    assert parse_shard("1/2") == (1, 2)
+    assert [location["city"] for location in shards[0]] == ["City0", "City2", "City4"]
+    assert [location["city"] for location in shards[1]] == ["City1", "City3"]
+    for invalid_shard in ["2/2", "-1/2", "0/0", "1"]:
+        with pytest.raises(ValueError):
+            parse_shard(invalid_shard)
+
+
+def test_merge_csv_files(tmp_path):
+    """
+    Testing the get_shard_file_path and merge_csv_files functions
+    """
+    output_file = str(tmp_path / "weather.csv")
+    shard_files = [get_shard_file_path(file=output_file, shard_index=index, shard_count=2) for index in range(2)]
+    with open(shard_files[0], "w") as f:
+        f.write("city,temp\nMilan,7.36\n")
+    with open(shard_files[1], "w") as f:
+        f.write("city,temp\nBologna,8.36\nCagliari,10.36\n")
+
+    merge_csv_files(files=shard_files, output_file=output_file)
+
+    expected_df = pd.DataFrame(data={"city": ["Milan", "Bologna", "Cagliari"], "temp": [7.36, 8.36, 10.36]})
+
+    assert shard_files[0] == str(tmp_path / "weather.part-0-of-2.csv")
+    assert_frame_equal(expected_df, read_csv(file_path=output_file))
+
+
+def test_merge_shard_files(tmp_path):
+    """
+    Testing the merge_shard_files function for the data and quarantine files of the shards
+    """
+    output_file = str(tmp_path / "weather.csv")
+    shard_files = [get_shard_file_path(file=output_file, shard_index=index, shard_count=2) for index in range(2)]
+    for shard_file, city in zip(shard_files, ["Milan", "Bologna"]):
+        with open(shard_file, "w") as f:
+            f.write(f"city,temp\n{city},7.36\n")
+    with open(str(tmp_path / "weather.part-1-of-2.quarantine.csv"), "w") as f:
+        f.write("city,reject_reason\nAtlantis,location not found\n")
+
+    merge_shard_files(file=output_file, shard_count=2)
+
+    expected_df = pd.DataFrame(data={"city": ["Atlantis"], "reject_reason": ["location not found"]})
+
+    assert read_csv(file_path=output_file)["city"].tolist() == ["Milan", "Bologna"]
+    assert_frame_equal(expected_df, read_csv(file_path=str(tmp_path / "weather.quarantine.csv")))
+
+    (tmp_path / "weather.part-1-of-2.quarantine.csv").unlink()
+    merge_shard_files(file=output_file, shard_count=2)
 
+    assert not (tmp_path / "weather.quarantine.csv").exists()
@@ -0,0 +1,52 @@
+import pandas as pd
+from pandas.testing import assert_frame_equal
+from src.utils import ConfigParser, read_csv
+from src.validation import validate_weather_data, get_quarantine_file_path, write_quarantine
+
+
+def test_validate_weather_data():
+    """
+    Testing the validate_weather_data function for clean and invalid weather data
+    """
+    config = ConfigParser(env="test")
+    clean_df = read_csv(file_path=config.weather_data_csv)
+
+    valid_df, rejected_df = validate_weather_data(clean_df)
+
+    assert_frame_equal(clean_df, valid_df)
+    assert rejected_df.empty
+
+    invalid_df = pd.concat([clean_df, clean_df.iloc[[0]]], ignore_index=True).astype({"pop": object})
+    invalid_df.loc[1, "weather"] = None
+    invalid_df.loc[2, "humidity_percentage"] = 130
+    invalid_df.loc[3, "pop"] = "unknown"
+
+    valid_df, rejected_df = validate_weather_data(invalid_df)
+
+    assert valid_df.index.tolist() == [0, 4, 5, 6, 7, 8]
+    assert rejected_df["reject_reason"].to_dict() == {
+        1: "missing weather",
+        2: "humidity_percentage out of range [0, 100]",
+        3: "invalid pop",
+        9: "duplicate",
+    }
+
+
+def test_write_quarantine(tmp_path):
+    """
+    Testing the get_quarantine_file_path and write_quarantine functions
+    """
+    quarantine_file = get_quarantine_file_path(str(tmp_path / "weather.csv"))
+    rejected_df = pd.DataFrame(data={"city": ["Milan"], "reject_reason": ["duplicate"]})
+
+    write_quarantine(rejected_df=rejected_df, file=quarantine_file)
+    write_quarantine(rejected_df=rejected_df, file=quarantine_file)
+
+    assert quarantine_file == str(tmp_path / "weather.quarantine.csv")
+    assert get_quarantine_file_path(str(tmp_path / "weather.csv"), stage="load-quarantine") == \
+        str(tmp_path / "weather.load-quarantine.csv")
+    assert_frame_equal(rejected_df, read_csv(file_path=quarantine_file))
+
+    write_quarantine(rejected_df=rejected_df.iloc[0:0], file=quarantine_file)
+
+    assert not (tmp_path / "weather.quarantine.csv").exists()
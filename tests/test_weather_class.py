@@ -41,6 +41,43 @@ def test_get_most_common_weather():
     assert_frame_equal(expected_df, actual_df)
 
 
+def test_get_most_common_weather_ties():
+    """
+    Testing the get_most_common_weather method from WeatherForecast class for tied weather conditions
+    """
+    expected_data = {
+        "city": ["Bologna", "Cagliari", "Milan", "Milan"],
+        "weather": ["Rain", "Clouds", "Clouds", "Rain"],
+        "weather_description": ["light rain", "overcast clouds", "overcast clouds", "light rain"]
+    }
+
+    expected_df = pd.DataFrame(data=expected_data)
+    actual_first_df = test_weather_forecast_object.get_most_common_weather(hours_forecast=2, ties="first")
+    actual_all_df = test_weather_forecast_object.get_most_common_weather(hours_forecast=2, ties="all")
+
+    assert_frame_equal(expected_df.drop(index=3), actual_first_df)
+    assert_frame_equal(expected_df, actual_all_df)
+
+
+def test_get_mode():
+    """
+    Testing the get_mode method from WeatherForecast class
+    """
+    expected_data = {
+        "horizon": [1, 1, 1, 3, 3, 3],
+        "city": ["Bologna", "Cagliari", "Milan", "Bologna", "Cagliari", "Milan"],
+        "weather": ["Rain", "Clouds", "Rain", "Rain", "Clouds", "Clouds"],
+        "percentage": [100.0, 100.0, 100.0, 100.0, 100.0, 67.0]
+    }
+
+    expected_df = pd.DataFrame(data=expected_data)
+    actual_df = test_weather_forecast_object.get_mode(columns=["weather"], hours_forecast=[1, 3])
+
+    assert_frame_equal(expected_df, actual_df)
+    with pytest.raises(ValueError):
+        test_weather_forecast_object.get_mode(columns=["temp"], hours_forecast=hours_forecast)
+
+
 def test_get_average_temp():
     """
     Testing the get_average_temp method from WeatherForecast class
@@ -103,3 +140,39 @@ def test_get_strongest_wind_city():
     actual_df = test_weather_forecast_object.get_strongest_wind_city(hours_forecast=hours_forecast)
 
     assert_frame_equal(expected_df, actual_df)
+
+
+def test_get_metric():
+    """
+    Testing the get_metric method from WeatherForecast class for multiple forecasting periods
+    """
+    expected_data = {
+        "horizon": [1, 1, 1, 3, 3, 3],
+        "city": ["Bologna", "Cagliari", "Milan", "Bologna", "Cagliari", "Milan"],
+        "average_temp": [8.36, 10.36, 7.36, 7.72, 8.38, 7.38]
+    }
+
+    expected_df = pd.DataFrame(data=expected_data)
+    actual_df = test_weather_forecast_object.get_metric(metric="average_temp", hours_forecast=[3, 1])
+
+    assert_frame_equal(expected_df, actual_df)
+    with pytest.raises(ValueError):
+        test_weather_forecast_object.get_metric(metric="unknown_metric", hours_forecast=hours_forecast)
+    with pytest.raises(ValueError):
+        test_weather_forecast_object.get_metric(metric="average_temp", hours_forecast=[1, 4])
+    with pytest.raises(ValueError):
+        test_weather_forecast_object.get_metric(metric="average_temp", hours_forecast=[])
+
+
+def test_load_weather_data_no_valid_rows(tmp_path):
+    """
+    Testing the load_weather_data method from WeatherForecast class for a weather CSV file without valid rows
+    """
+    weather_forecast_object = WeatherForecast(test=True, database="sqlite://")
+    invalid_df = weather_forecast_object.weather_data.assign(temp=100.0)
+    weather_forecast_object.config.weather_data_csv = str(tmp_path / "weather.csv")
+    invalid_df.to_csv(weather_forecast_object.config.weather_data_csv, index=False)
+
+    with pytest.raises(ValueError):
+        weather_forecast_object.load_weather_data()
+    assert len(pd.read_csv(tmp_path / "weather.load-quarantine.csv")) == len(invalid_df)